@@ -4,18 +4,36 @@ import re
 import requests
 import time
 import json
+import zipfile
+import zlib
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from io import BytesIO
 from pathlib import Path
-import nbformat
+from typing import Any, Dict, List
+import numpy as np
+from scipy.sparse import csr_matrix
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from dotenv import load_dotenv
+try:
+    from orjson import loads as json_loads
+except ImportError:
+    from json import loads as json_loads
 from pinecone import Pinecone, ServerlessSpec
+from pinecone.exceptions import NotFoundException
 from langchain_huggingface import HuggingFaceEmbeddings
 from langchain_community.retrievers import PineconeHybridSearchRetriever
-from pinecone_text.sparse import BM25Encoder
+from langchain_community.retrievers.pinecone_hybrid_search import hash_text
 from langchain_text_splitters import RecursiveCharacterTextSplitter
 from langchain_groq import ChatGroq
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.runnables import RunnablePassthrough
 from langchain_core.output_parsers import StrOutputParser
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+from langchain_core.retrievers import BaseRetriever
+from pydantic import ConfigDict
 
 # Load environment variables
 load_dotenv()
@@ -23,13 +41,37 @@ load_dotenv()
 # Constants
 BM25_PATH = "bm25_encoder.json"
 INDEX_NAME = "rbi-interview"
+EMBEDDING_BACKEND = os.getenv("EMBEDDING_BACKEND", "torch")
+ONNX_MODEL_FILE = "onnx/model_quint8_avx2.onnx"
+EMBED_BATCH_SIZE = 64
+INDEX_WAIT_TIMEOUT = 60
+# Repositories with more chunks than this are indexed in Pinecone instead of in memory
+PINECONE_MIN_CHUNKS = 10000
+CHUNK_SIZE = 400
+CHUNK_OVERLAP = 50
 SKIP_EXTENSIONS = {
     ".png", ".jpg", ".jpeg", ".gif", ".bmp", ".svg", ".webp",
     ".ico", ".tiff", ".tif", ".mp3", ".mp4", ".wav", ".avi",
     ".mov", ".zip", ".tar", ".gz", ".rar", ".7z", ".pdf",
     ".exe", ".dll", ".so", ".csv", ".tsv"
 }
+SKIP_DIRS = {"node_modules", ".git", "__pycache__"}
 TEXT_EXTENSIONS = {".txt", ".py", ".md", ".json", ".yaml", ".yml", ".html", ".js", ".jsx", ".ts", ".tsx"}
+# Extensions iter_file_texts converts; every other member is left unread
+CONSUMED_EXTENSIONS = TEXT_EXTENSIONS | {".ipynb"}
+HTTP_POOL_SIZE = 32
+# (connect, read) seconds; the read timeout applies between streamed chunks
+DOWNLOAD_TIMEOUT = (10, 60)
+MAX_EXTRACT_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+# A whole number of encoder batches, so every embed_documents call runs full batches
+UPLOAD_BATCH_SIZE = 2 * EMBED_BATCH_SIZE
+# Kept low to stay within Pinecone per-index request limits
+MAX_UPLOAD_WORKERS = 8
+_RE_GITHUB_URL = re.compile(r"https://github.com/([^/]+)/([^/]+)")
+_RE_NL = re.compile(r"\n+")
+_RE_WS = re.compile(r"[ \t]+")
+_RE_TOK = re.compile(r"\w+")
+_RE_QUESTION = re.compile(r'^\s*(?:\d+[.)]|[-•])\s*(\S.*?)\s*$')
 
 # Set page config
 st.set_page_config(page_title="GitHub Repo Interview Bot", page_icon="💼", layout="wide")
@@ -48,177 +90,407 @@ if 'interview_started' not in st.session_state:
 if 'processing' not in st.session_state:
     st.session_state.processing = False
 
-def download_github_repo(repo_url, save_dir="data/repo_files"):
-    """Download GitHub repository files"""
+@st.cache_resource
+def get_http_session():
+    """Create one pooled keep-alive HTTP session shared by every GitHub fetch"""
+    session = requests.Session()
+    retry = Retry(
+        total=3,
+        backoff_factor=0.3,
+        status_forcelist=[429, 502, 503, 504],
+        respect_retry_after_header=True
+    )
+    adapter = HTTPAdapter(pool_connections=HTTP_POOL_SIZE, pool_maxsize=HTTP_POOL_SIZE, max_retries=retry)
+    session.mount("https://", adapter)
+    return session
+
+def should_skip_file(path):
+    """Check whether a repository path is in a skipped folder or has a skipped extension"""
+    parts = path.split("/")
+    if any(part.lower() in SKIP_DIRS for part in parts[:-1]):
+        return True
+    
+    ext = os.path.splitext(parts[-1])[1].lower()
+    return ext in SKIP_EXTENSIONS
+
+def parse_github_url(repo_url):
+    """Extract the owner and repository name from a GitHub URL"""
     repo_url = repo_url.replace(".git", "")
-    match = re.match(r"https://github.com/([^/]+)/([^/]+)", repo_url)
+    match = _RE_GITHUB_URL.match(repo_url)
     
     if not match:
         raise ValueError("Invalid GitHub URL")
     
-    user, repo = match.groups()
-    api_url = f"https://api.github.com/repos/{user}/{repo}/contents"
+    return match.groups()
+
+def download_github_repo(repo_url):
+    """Download GitHub repository text files into memory"""
+    user, repo = parse_github_url(repo_url)
+    # HEAD resolves to the default branch without an API call
+    zip_url = f"https://github.com/{user}/{repo}/archive/HEAD.zip"
+    
+    session = get_http_session()
+    response = session.get(zip_url, stream=True, timeout=DOWNLOAD_TIMEOUT)
+    response.raise_for_status()
     
-    os.makedirs(save_dir, exist_ok=True)
+    buffer = BytesIO()
+    for chunk in response.iter_content(64 * 1024):
+        buffer.write(chunk)
     
-    def download_recursive(api_path, local_path):
-        response = requests.get(api_path)
-        data = response.json()
+    def read_member(info):
+        # Strip the "<repo>-<branch>/" folder GitHub adds to archives
+        path = info.filename.split("/", 1)[-1]
+        if should_skip_file(path):
+            return None
         
-        if isinstance(data, dict) and "message" in data:
-            st.error(f"GitHub API Error: {data['message']}")
-            return
+        ext = os.path.splitext(path)[1].lower()
+        if ext not in CONSUMED_EXTENSIONS:
+            return None
         
-        for item in data:
-            name = item["name"]
-            file_path = os.path.join(local_path, name)
-            
-            if name.lower() in ["node_modules", ".git", "__pycache__"]:
-                continue
-            
-            if item["type"] == "dir":
-                os.makedirs(file_path, exist_ok=True)
-                download_recursive(item["url"], file_path)
-            
-            elif item["type"] == "file":
-                ext = os.path.splitext(name)[1].lower()
-                if ext in SKIP_EXTENSIONS:
-                    continue
-                
-                file_data = requests.get(item["download_url"]).content
-                with open(file_path, "wb") as f:
-                    f.write(file_data)
+        # Consumed extensions are all text formats, so members are not sniffed
+        return path, z.read(info)
+    
+    # Decompression releases the GIL, so members are inflated in parallel
+    with zipfile.ZipFile(buffer) as z, ThreadPoolExecutor(max_workers=MAX_EXTRACT_WORKERS) as executor:
+        members = [info for info in z.infolist() if not info.is_dir()]
+        results = executor.map(read_member, members)
+        files = dict(result for result in results if result)
     
-    download_recursive(api_url, save_dir)
-    return True
+    return files
 
-def convert_repo_to_text(input_dir="data/repo_files", output_file="data/combined_repo.txt"):
-    """Convert repository files to combined text"""
-    all_texts = []
-    
-    for root, dirs, files in os.walk(input_dir):
-        for file in files:
-            file_path = os.path.join(root, file)
-            ext = os.path.splitext(file)[1].lower()
+def iter_file_texts(files):
+    """Yield the text of each repository file, consuming the files dict"""
+    # Pop each file as it is converted so raw bytes and decoded text never both
+    # hold the whole repository
+    for path in list(files):
+        data = files.pop(path)
+        file = os.path.basename(path)
+        ext = os.path.splitext(file)[1].lower()
+        
+        try:
+            if ext in TEXT_EXTENSIONS:
+                content = data.decode("utf-8", errors="ignore")
             
-            try:
-                if ext in TEXT_EXTENSIONS:
-                    with open(file_path, "r", encoding="utf-8", errors="ignore") as f:
-                        content = f.read()
-                        all_texts.append(f"\n\n===== FILE: {file} =====\n\n{content}")
-                
-                elif ext == ".ipynb":
-                    with open(file_path, "r", encoding="utf-8", errors="ignore") as f:
-                        nb = nbformat.read(f, as_version=4)
-                        cells_text = []
-                        for cell in nb.cells:
-                            if cell.cell_type in ["code", "markdown"]:
-                                cells_text.append(cell.source)
-                        all_texts.append(f"\n\n===== FILE: {file} =====\n\n" + "\n\n".join(cells_text))
+            elif ext == ".ipynb":
+                # Only cell types and sources are needed, so skip nbformat's validation
+                nb = json_loads(data.decode("utf-8", errors="ignore"))
+                cells_text = []
+                for cell in nb.get("cells", []):
+                    if cell.get("cell_type") in ("code", "markdown"):
+                        source = cell.get("source", "")
+                        if isinstance(source, list):
+                            source = "".join(source)
+                        cells_text.append(source)
+                content = "\n\n".join(cells_text)
             
-            except Exception as e:
+            else:
                 continue
+        
+        except Exception as e:
+            continue
+        
+        yield f"===== FILE: {file} =====\n\n{content}"
+
+def flatten_text(text):
+    """Flatten text by removing extra whitespace, keeping line breaks for the splitter"""
+    flat_text = _RE_NL.sub("\n", text)
+    flat_text = _RE_WS.sub(" ", flat_text)
+    return flat_text.strip()
+
+def iter_chunks(files, splitter):
+    """Yield chunks file by file so the combined repository text is never built"""
+    for text in iter_file_texts(files):
+        for chunk in splitter.split_text(flatten_text(text)):
+            # Pinecone rejects empty sparse vectors, so drop chunks without any tokens
+            if _RE_TOK.search(chunk):
+                yield chunk
+
+class BM25SparseEncoder:
+    """BM25 sparse encoder compatible with PineconeHybridSearchRetriever"""
     
-    os.makedirs(os.path.dirname(output_file), exist_ok=True)
-    with open(output_file, "w", encoding="utf-8") as f:
-        f.write("\n\n".join(all_texts))
+    def __init__(self, k1=1.2, b=0.75):
+        self.k1 = k1
+        self.b = b
+        self.n_docs = 0
+        self.avgdl = 0.0
+        self.idf = {}
+    
+    @staticmethod
+    def _token_ids(text):
+        # crc32 gives stable 32-bit sparse indices without keeping a vocabulary
+        return [zlib.crc32(token.encode("utf-8")) for token in _RE_TOK.findall(text.lower())]
+    
+    def _idf(self, df):
+        return np.log((self.n_docs - df + 0.5) / (df + 0.5) + 1.0)
+    
+    def fit(self, corpus):
+        """Compute document frequencies and IDF weights for the corpus"""
+        df = Counter()
+        total_len = 0
+        for doc in corpus:
+            ids = self._token_ids(doc)
+            total_len += len(ids)
+            df.update(set(ids))
+        
+        self.n_docs = len(corpus)
+        self.avgdl = total_len / max(self.n_docs, 1)
+        indices = list(df)
+        idf = self._idf(np.fromiter(df.values(), dtype=np.float64, count=len(df)))
+        self.idf = dict(zip(indices, idf.tolist()))
+        return self
     
-    return output_file
+    def _encode_document(self, text):
+        ids = self._token_ids(text)
+        tf_counts = Counter(ids)
+        indices = list(tf_counts)
+        tf = np.fromiter(tf_counts.values(), dtype=np.float64, count=len(tf_counts))
+        norm = self.k1 * (1 - self.b + self.b * len(ids) / max(self.avgdl, 1e-9))
+        values = tf * (self.k1 + 1) / (tf + norm)
+        return {"indices": indices, "values": values.tolist()}
+    
+    def _encode_query(self, text):
+        indices = list(dict.fromkeys(self._token_ids(text)))
+        # Unseen terms get the IDF of a term with no document matches
+        idf = np.array([self.idf.get(i, self._idf(0)) for i in indices], dtype=np.float64)
+        total = idf.sum()
+        values = idf / total if total > 0 else idf
+        return {"indices": indices, "values": values.tolist()}
+    
+    def encode_documents(self, texts):
+        """Encode documents as BM25 term-frequency sparse vectors"""
+        if isinstance(texts, str):
+            return self._encode_document(texts)
+        return [self._encode_document(t) for t in texts]
+    
+    def encode_queries(self, texts):
+        """Encode queries as normalized IDF sparse vectors"""
+        if isinstance(texts, str):
+            return self._encode_query(texts)
+        return [self._encode_query(t) for t in texts]
+    
+    def dump(self, path):
+        """Save the fitted parameters as JSON"""
+        params = {
+            "k1": self.k1,
+            "b": self.b,
+            "n_docs": self.n_docs,
+            "avgdl": self.avgdl,
+            "idf": {str(i): v for i, v in self.idf.items()}
+        }
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(params, f)
 
-def flatten_text(input_file, output_file="data/flattened_repo.txt"):
-    """Flatten text by removing extra whitespace"""
-    with open(input_file, "r", encoding="utf-8") as f:
-        text = f.read()
+class InMemoryHybridRetriever(BaseRetriever):
+    """In-process hybrid retriever scoring chunks with NumPy instead of Pinecone"""
     
-    flat_text = re.sub(r"\n+", "\n", text)
-    flat_text = re.sub(r"[ \t]+", " ", flat_text)
-    flat_text = flat_text.strip()
+    embeddings: Embeddings
+    sparse_encoder: Any
+    texts: List[str]
+    dense_matrix: Any
+    sparse_matrix: Any
+    sparse_columns: Dict[int, int]
+    top_k: int = 4
+    alpha: float = 0.5
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+    
+    @classmethod
+    def from_texts(cls, texts, embeddings, sparse_encoder, **kwargs):
+        """Embed and sparse-encode texts into in-memory matrices"""
+        dense_matrix = np.asarray(embeddings.embed_documents(texts), dtype=np.float32)
+        
+        # Map hashed sparse indices onto a compact column range
+        sparse_columns = {}
+        rows, cols, values = [], [], []
+        for row, vec in enumerate(sparse_encoder.encode_documents(texts)):
+            for index, value in zip(vec["indices"], vec["values"]):
+                rows.append(row)
+                cols.append(sparse_columns.setdefault(index, len(sparse_columns)))
+                values.append(value)
+        sparse_matrix = csr_matrix((values, (rows, cols)), shape=(len(texts), len(sparse_columns)), dtype=np.float32)
+        
+        return cls(
+            embeddings=embeddings,
+            sparse_encoder=sparse_encoder,
+            texts=texts,
+            dense_matrix=dense_matrix,
+            sparse_matrix=sparse_matrix,
+            sparse_columns=sparse_columns,
+            **kwargs
+        )
     
-    os.makedirs(os.path.dirname(output_file), exist_ok=True)
-    with open(output_file, "w", encoding="utf-8") as out:
-        out.write(flat_text)
+    def _get_relevant_documents(self, query, *, run_manager):
+        if not self.texts:
+            return []
+        
+        dense_query = np.asarray(self.embeddings.embed_query(query), dtype=np.float32)
+        sparse_query = np.zeros(len(self.sparse_columns), dtype=np.float32)
+        vec = self.sparse_encoder.encode_queries(query)
+        for index, value in zip(vec["indices"], vec["values"]):
+            if index in self.sparse_columns:
+                sparse_query[self.sparse_columns[index]] = value
+        
+        # Same convex combination Pinecone's hybrid search applies
+        scores = self.alpha * (self.dense_matrix @ dense_query) + (1 - self.alpha) * (self.sparse_matrix @ sparse_query)
+        
+        k = min(self.top_k, len(self.texts))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return [Document(page_content=self.texts[i], metadata={"score": float(scores[i])}) for i in top]
+
+@st.cache_resource
+def get_embeddings():
+    """Load the embedding model once per process"""
+    model_kwargs = {"device": "cpu"}
+    if EMBEDDING_BACKEND == "onnx":
+        # int8 dynamically quantized ONNX export shipped with the model
+        model_kwargs.update(backend="onnx", model_kwargs={"file_name": ONNX_MODEL_FILE})
     
-    return output_file
+    return HuggingFaceEmbeddings(
+        model_name="sentence-transformers/all-MiniLM-L6-v2",
+        model_kwargs=model_kwargs,
+        encode_kwargs={"normalize_embeddings": True, "batch_size": EMBED_BATCH_SIZE}
+    )
+
+@st.cache_resource
+def get_pinecone_client():
+    """Create the Pinecone client once per process"""
+    return Pinecone(api_key=os.getenv("PINECONE_API_KEY"))
 
-def convert_to_single_line(input_file="data/flattened_repo.txt"):
-    """Convert text to single line"""
-    with open(input_file, "r", encoding="utf-8") as f:
-        text = f.read()
+def wait_until(condition, message, timeout=INDEX_WAIT_TIMEOUT):
+    """Poll condition with exponential backoff until it holds or timeout expires"""
+    deadline = time.monotonic() + timeout
+    delay = 0.5
     
-    single_line = " ".join(text.split())
-    return single_line
+    while not condition():
+        if time.monotonic() >= deadline:
+            raise TimeoutError(message)
+        time.sleep(delay)
+        delay = min(delay * 2, 8)
 
-def initialize_pinecone():
-    """Initialize Pinecone index"""
-    api_key = os.getenv("PINECONE_API_KEY")
-    pc = Pinecone(api_key=api_key)
+def delete_pinecone_index(pc):
+    """Delete the Pinecone index so it can be rebuilt from scratch"""
+    # timeout=-1 returns immediately so wait_until does the (capped) polling
+    pc.delete_index(INDEX_NAME, timeout=-1)
+    wait_until(
+        lambda: INDEX_NAME not in [i.name for i in pc.list_indexes()],
+        f"Timed out waiting for index '{INDEX_NAME}' to be deleted"
+    )
+
+def initialize_pinecone(fresh=False):
+    """Initialize Pinecone index, reusing it unless a fresh build is requested"""
+    pc = get_pinecone_client()
     existing = [i.name for i in pc.list_indexes()]
     
-    if INDEX_NAME in existing:
-        pc.delete_index(INDEX_NAME)
-        time.sleep(5)
+    if INDEX_NAME in existing and fresh:
+        delete_pinecone_index(pc)
+        existing.remove(INDEX_NAME)
     
-    pc.create_index(
-        name=INDEX_NAME,
-        dimension=384,
-        metric='dotproduct',
-        spec=ServerlessSpec(cloud='aws', region='us-east-1')
-    )
-    time.sleep(30)
+    if INDEX_NAME not in existing:
+        pc.create_index(
+            name=INDEX_NAME,
+            dimension=384,
+            metric='dotproduct',
+            spec=ServerlessSpec(cloud='aws', region='us-east-1'),
+            timeout=-1
+        )
+        wait_until(
+            lambda: pc.describe_index(INDEX_NAME).status["ready"],
+            f"Timed out waiting for index '{INDEX_NAME}' to become ready"
+        )
     
     return pc.Index(INDEX_NAME)
 
-def process_repository(repo_url):
+def clear_namespace(index, namespace):
+    """Delete all vectors in a namespace so a re-processed repository starts clean"""
+    try:
+        index.delete(delete_all=True, namespace=namespace)
+    except NotFoundException:
+        # Nothing has been uploaded for this repository yet
+        pass
+
+def encode_vectors(retriever, texts):
+    """Build Pinecone hybrid vectors for texts the same way add_texts does"""
+    dense_embeds = retriever.embeddings.embed_documents(texts)
+    sparse_embeds = retriever.sparse_encoder.encode_documents(texts)
+    
+    return [
+        {
+            "id": hash_text(text),
+            "sparse_values": sparse,
+            "values": dense,
+            "metadata": {retriever.text_key: text}
+        }
+        for text, dense, sparse in zip(texts, dense_embeds, sparse_embeds)
+    ]
+
+def upload_chunks(retriever, chunks):
+    """Encode chunks and upsert them to the vector database in concurrent batches"""
+    batches = [chunks[i:i + UPLOAD_BATCH_SIZE] for i in range(0, len(chunks), UPLOAD_BATCH_SIZE)]
+    progress = st.progress(0.0)
+    
+    # The encoder is CPU-bound and already uses every core, so it runs on this
+    # thread; the pool only overlaps the network upserts with the next batch
+    with ThreadPoolExecutor(max_workers=MAX_UPLOAD_WORKERS) as executor:
+        futures = []
+        for done, batch in enumerate(batches, start=1):
+            vectors = encode_vectors(retriever, batch)
+            futures.append(executor.submit(retriever.index.upsert, vectors=vectors, namespace=retriever.namespace))
+            progress.progress(done / len(batches))
+        
+        for future in futures:
+            future.result()
+
+def process_repository(repo_url, fresh_index=False):
     """Process repository and create retriever"""
     try:
         # Download repo
         st.info("📥 Downloading repository...")
-        download_github_repo(repo_url)
+        files = download_github_repo(repo_url)
         
-        # Convert to text
-        st.info("📄 Converting files to text...")
-        combined_file = convert_repo_to_text()
-        
-        # Flatten text
-        st.info("🔄 Processing text...")
-        flattened_file = flatten_text(combined_file)
-        combined_text = convert_to_single_line(flattened_file)
-        
-        # Split into chunks
-        st.info("✂️ Splitting into chunks...")
+        # Convert, flatten and split each file into chunks
+        st.info("✂️ Converting files and splitting into chunks...")
         splitter = RecursiveCharacterTextSplitter(
-            chunk_size=400,
-            chunk_overlap=50,
+            chunk_size=CHUNK_SIZE,
+            chunk_overlap=CHUNK_OVERLAP,
             length_function=len,
             separators=["\n\n", "\n", ".", "!", "?", ",", " ", ""]
         )
-        chunks = splitter.split_text(combined_text)
-        
-        # Initialize Pinecone
-        st.info("🗄️ Setting up vector database...")
-        index = initialize_pinecone()
+        # BM25 needs every chunk before it can encode any, so the chunks are
+        # collected here; the combined repository text is never materialized
+        chunks = list(iter_chunks(files, splitter))
         
         # Setup embeddings and BM25
         st.info("🧠 Creating embeddings...")
-        embeddings = HuggingFaceEmbeddings(
-            model_name="sentence-transformers/all-MiniLM-L6-v2",
-            model_kwargs={"device": "cpu"},
-            encode_kwargs={"normalize_embeddings": True}
-        )
+        embeddings = get_embeddings()
         
-        bm25 = BM25Encoder().default()
+        bm25 = BM25SparseEncoder()
         bm25.fit(chunks)
         bm25.dump(BM25_PATH)
         
-        # Create retriever
-        retriever = PineconeHybridSearchRetriever(
-            embeddings=embeddings,
-            sparse_encoder=bm25,
-            index=index
-        )
+        if len(chunks) > PINECONE_MIN_CHUNKS:
+            # Initialize Pinecone
+            st.info("🗄️ Setting up vector database...")
+            index = initialize_pinecone(fresh=fresh_index)
+            
+            # Create retriever, scoped to this repository's namespace so the index
+            # can be reused across repositories without deleting it
+            retriever = PineconeHybridSearchRetriever(
+                embeddings=embeddings,
+                sparse_encoder=bm25,
+                index=index,
+                namespace="/".join(parse_github_url(repo_url))
+            )
+            
+            # Ids are content hashes, so chunks from an older version of the
+            # repository would otherwise stay next to the new ones
+            clear_namespace(index, retriever.namespace)
+            
+            st.info("⬆️ Uploading to vector database...")
+            upload_chunks(retriever, chunks)
         
-        st.info("⬆️ Uploading to vector database...")
-        retriever.add_texts(chunks)
+        else:
+            # Small repositories fit in memory, so skip the network round trips
+            retriever = InMemoryHybridRetriever.from_texts(chunks, embeddings, bm25)
         
         return retriever, len(chunks)
     
@@ -276,17 +548,8 @@ Output format:
         
         answer = rag_chain.invoke("Generate interview questions based on this project.")
         
-        # Parse questions
-        questions = []
-        lines = answer.strip().split('\n')
-        for line in lines:
-            line = line.strip()
-            if line and (line[0].isdigit() or line.startswith('-') or line.startswith('•')):
-                # Remove numbering
-                question = re.sub(r'^\d+[\.)]\s*', '', line)
-                question = re.sub(r'^[-•]\s*', '', question)
-                if question:
-                    questions.append(question)
+        # Parse numbered or bulleted lines, capturing the text after the marker
+        questions = [m.group(1) for line in answer.splitlines() if (m := _RE_QUESTION.match(line))]
         
         return questions
     
@@ -306,6 +569,10 @@ with st.sidebar:
         placeholder="https://github.com/username/repo",
         help="Enter the full GitHub repository URL"
     )
+    fresh_index = st.checkbox(
+        "Rebuild vector index",
+        help="Delete and recreate the Pinecone index before processing (only used for large repositories)"
+    )
     
     if st.button("🚀 Start Interview Process", type="primary", disabled=st.session_state.processing):
         if repo_url:
@@ -315,7 +582,7 @@ with st.sidebar:
             st.session_state.answers = {}
             
             with st.spinner("Processing repository..."):
-                retriever, chunk_count = process_repository(repo_url)
+                retriever, chunk_count = process_repository(repo_url, fresh_index)
                 
                 if retriever:
                     st.session_state.retriever = retriever